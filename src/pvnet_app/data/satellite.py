@@ -2,6 +2,7 @@ import logging
 import os
 import shutil
 import zipfile
+from collections.abc import MutableMapping
 
 import fsspec
 import numpy as np
@@ -158,8 +159,15 @@ def fill_1d_bool_gaps(x, max_gap):
     return np.logical_or(should_fill, x)
 
 
-def interpolate_missing_satellite_timestamps(max_gap: pd.Timedelta, zarr_path: str = sat_path) -> None:
-    """Interpolate missing satellite timestamps"""
+def interpolate_missing_satellite_timestamps(
+    max_gap: pd.Timedelta, zarr_path: str | MutableMapping[str, bytes] = sat_path,
+) -> None:
+    """Interpolate missing satellite timestamps
+
+    Args:
+        max_gap: The largest gap in the timestamps which will be filled by interpolation
+        zarr_path: The path to, or store of, the satellite zarr. This is overwritten in place
+    """
     ds_sat = xr.open_zarr(zarr_path)
 
     # If any of these times are missing, we will try to interpolate them
@@ -216,18 +224,19 @@ def interpolate_missing_satellite_timestamps(max_gap: pd.Timedelta, zarr_path: s
                 f"{not_infilled_times.time.values}",
             )
 
-        # Save the interpolated data
-        shutil.rmtree(zarr_path)
-        ds_sat_filtered.to_zarr(zarr_path)
+        # Save the interpolated data. This has been loaded into memory so can overwrite the input
+        ds_sat_filtered.to_zarr(zarr_path, mode="w")
 
 
 def extend_satellite_data_with_nans(
-    t0: pd.Timestamp, satellite_data_path: str | None = sat_path,
+    t0: pd.Timestamp, satellite_data_path: str | MutableMapping[str, bytes] = sat_path,
 ) -> None:
     """Fill the satellite data with NaNs out to time t0
 
     Args:
         t0: The init-time of the forecast
+        satellite_data_path: The path to, or store of, the satellite zarr. This is overwritten in
+            place
     """
     # Find how delayed the satellite data is
     ds_sat = xr.open_zarr(satellite_data_path)
@@ -254,9 +263,7 @@ def extend_satellite_data_with_nans(
         ds_sat = ds_sat.reindex(time=np.concatenate([ds_sat.time, fill_times]), fill_value=np.nan)
 
         # Re-save inplace
-        if satellite_data_path is not None:
-            shutil.rmtree(satellite_data_path)
-        ds_sat.to_zarr(satellite_data_path)
+        ds_sat.to_zarr(satellite_data_path, mode="w")
 
 
 def check_model_satellite_inputs_available(
@@ -350,16 +357,25 @@ def preprocess_sat_data(t0: pd.Timestamp, use_legacy: bool = False) -> pd.Dateti
     return sat_timestamps
 
 
-def check_for_constant_values(value: float | None = 0, threshold: float | None = ERROR_ZERO_PERCENTAGE) -> None:
+def check_for_constant_values(
+    value: float | None = 0,
+    threshold: float | None = ERROR_ZERO_PERCENTAGE,
+    zarr_path: str | MutableMapping[str, bytes] = sat_path,
+) -> None:
     """Check the satellite data for constant values and raise an exception
 
     This sometimes happen when the satellite data is corrupt
 
     Note that in the UK, even at night, the values are not zero.
+
+    Args:
+        value: The constant value to check for
+        threshold: The fraction of values in a timestep above which an exception is raised
+        zarr_path: The path to, or store of, the satellite zarr
     """
     # check satellite for zeros
     logger.info(f"Checking satellite data for constant value ({value})")
-    ds_sat = xr.open_zarr(sat_path)
+    ds_sat = xr.open_zarr(zarr_path)
     shape = ds_sat.data.shape
     n_data_points_per_timestep = shape[1] * shape[2] * shape[3]
     n_time_steps = shape[0]
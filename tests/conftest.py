@@ -220,4 +220,17 @@ def sat_15_data(test_t0):
 
 @pytest.fixture(scope="session")
 def sat_15_data_small(sat_15_data):
-    return sat_15_data.isel(x_geostationary=slice(0, 10), y_geostationary=slice(0, 10))
\ No newline at end of file
+    return sat_15_data.isel(x_geostationary=slice(0, 10), y_geostationary=slice(0, 10))
+
+
+@pytest.fixture()
+def sat_tmpdir(tmp_path, monkeypatch):
+    """Temporary working directory with the satellite download path set
+
+    The satellite download and preprocessing functions save to paths relative to the working
+    directory, so giving each test its own working directory means tests can be run in parallel
+    with pytest-xdist. Tests which don't call these functions should use explicit paths instead.
+    """
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("SATELLITE_ZARR_PATH", str(tmp_path / "latest.zarr.zip"))
+    return tmp_path
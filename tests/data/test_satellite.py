@@ -8,10 +8,13 @@ Tests for download_sat_data and preprocess_sat_data
 5. Download and process 15 minute
 6. Download and process 5 and 15 minute, then use 15 minute
 
-Note that I'm not sure these tests will work in parallel, due to files being saved in the same places
+Each test runs in its own temporary working directory (see the `sat_tmpdir` fixture) so these can
+be run in parallel, e.g. `python -m pytest -n auto tests/data/test_satellite.py`
 """
 import os
+import shutil
 import tempfile
+from contextlib import nullcontext
 from datetime import datetime, timedelta
 
 import numpy as np
@@ -33,265 +36,265 @@ from pvnet_app.data.satellite import (
 )
 
 
-def save_to_zarr_zip(ds, filename):
-    encoding = {"data": {"dtype": "int16"}}
-    with zarr.ZipStore(filename) as store:
-        ds.to_zarr(store, compute=True, mode="w", encoding=encoding, consolidated=True)
+# Satellite timestamps used in test_check_model_satellite_inputs_available
+_SAT_T0 = datetime(2023, 1, 1)
+_SAT_DATETIMES_1 = pd.date_range(
+    _SAT_T0 - timedelta(minutes=120), _SAT_T0 - timedelta(minutes=5), freq="5min",
+)
+_SAT_DATETIMES_2 = pd.date_range(
+    _SAT_T0 - timedelta(minutes=120), _SAT_T0 - timedelta(minutes=15), freq="5min",
+)
+_SAT_DATETIMES_3 = pd.date_range(
+    _SAT_T0 - timedelta(minutes=120), _SAT_T0 - timedelta(minutes=35), freq="5min",
+)
+_SAT_DATETIMES_4 = _SAT_DATETIMES_1.drop(_SAT_T0 - timedelta(minutes=30))
+_SAT_DATETIMES_5 = _SAT_DATETIMES_1.drop(_SAT_T0 - timedelta(minutes=60))
 
 
-def check_timesteps(sat_path, expected_freq_mins):
-    ds_sat = xr.open_zarr(sat_path)
+def save_to_zarr_zip(ds, filename, with_data=True):
+    """Save the dataset to zarr, zipping the store if the filename ends in `.zip`
 
-    if not isinstance(expected_freq_mins, list):
-        expected_freq_mins = [expected_freq_mins]
+    Dask-backed data is written to a directory store first so its chunks can be written in
+    parallel, since a zip store only allows writes through a single file handle. It is then copied
+    into the zip store at the end. Numpy-backed data is written serially anyway, so is written
+    straight into the zip store.
 
-    dts = pd.to_datetime(ds_sat.time).diff()[1:]
-    assert (np.isin(dts, [np.timedelta64(m, "m") for m in expected_freq_mins])).all(), dts
+    If `with_data` is False only the coordinates are saved. This is enough for tests which only
+    check the timestamps.
+    """
+    if with_data:
+        # Save the data as a single chunk, unless it is dask-backed. Then the zarr chunks must line
+        # up with the dask chunks
+        data_chunks = ds["data"].chunks
+        encoding = {
+            "data": {
+                "dtype": "int16",
+                "chunks": ds["data"].shape if data_chunks is None else [c[0] for c in data_chunks],
+                "compressor": zarr.Blosc(cname="lz4", clevel=1, shuffle=zarr.Blosc.BITSHUFFLE),
+            },
+        }
+    else:
+        ds = ds.drop_vars("data")
+        encoding = {}
+
+    filename = str(filename)
+    to_zarr_kwargs = {"compute": True, "mode": "w", "encoding": encoding, "consolidated": True}
+
+    # Only dask-backed data is written in parallel, so only this needs the synchronizer
+    if ds.chunks:
+        to_zarr_kwargs["synchronizer"] = zarr.ThreadSynchronizer()
+
+    if not filename.endswith(".zip"):
+        ds.to_zarr(filename, **to_zarr_kwargs)
+
+    elif not ds.chunks:
+        with zarr.ZipStore(filename, mode="w") as zip_store:
+            ds.to_zarr(zip_store, **to_zarr_kwargs)
+
+    else:
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            dir_store = zarr.DirectoryStore(tmpdirname)
+            ds.to_zarr(dir_store, **to_zarr_kwargs)
+            with zarr.ZipStore(filename, mode="w") as zip_store:
+                zarr.copy_store(dir_store, zip_store)
+
+
+@pytest.fixture(scope="module")
+def sat_5_zip(sat_5_data, tmp_path_factory):
+    """5-minutely satellite data saved once as a zipped zarr, to be copied into each test"""
+    filename = tmp_path_factory.mktemp("sat_5") / "latest.zarr.zip"
+    save_to_zarr_zip(sat_5_data, filename=filename)
+    return filename
+
+
+@pytest.fixture(scope="module")
+def sat_5_delayed_zip(sat_5_data_delayed, tmp_path_factory):
+    """Delayed 5-minutely satellite data saved once as a zipped zarr, to be copied into each test"""
+    filename = tmp_path_factory.mktemp("sat_5_delayed") / "latest.zarr.zip"
+    save_to_zarr_zip(sat_5_data_delayed, filename=filename)
+    return filename
+
+
+@pytest.fixture(scope="module")
+def sat_15_zip(sat_15_data, tmp_path_factory):
+    """15-minutely satellite data saved once as a zipped zarr, to be copied into each test"""
+    filename = tmp_path_factory.mktemp("sat_15") / "latest_15.zarr.zip"
+    save_to_zarr_zip(sat_15_data, filename=filename)
+    return filename
 
 
-def test_download_sat_5_data(sat_5_data):
-    """Download only the 5 minute satellite data"""
+def check_timesteps(sat_path, expected_freq_mins):
+    # All the stores checked here are saved with consolidated metadata. Only the time coordinate
+    # is loaded
+    times = xr.open_zarr(sat_path, consolidated=True).time.values
 
-    # make temporary directory
-    with tempfile.TemporaryDirectory() as tmpdirname:
+    dts = np.diff(times).astype("timedelta64[m]").astype(np.int64)
+    assert np.isin(dts, np.atleast_1d(expected_freq_mins)).all(), dts
 
-        # Change to temporary working directory
-        os.chdir(tmpdirname)
 
-        # Make 5-minutely satellite data available
-        save_to_zarr_zip(sat_5_data, filename="latest.zarr.zip")
+@pytest.mark.usefixtures("sat_tmpdir")
+def test_download_sat_5_data(sat_5_data):
+    """Download only the 5 minute satellite data"""
+
+    # Make 5-minutely satellite data available. Only the timestamps are checked
+    save_to_zarr_zip(sat_5_data, filename="latest.zarr.zip", with_data=False)
 
-        os.environ["SATELLITE_ZARR_PATH"] = "latest.zarr.zip"
-        download_all_sat_data()
+    download_all_sat_data()
 
-        # Assert that the file 'sat_5_path' exists
-        assert os.path.exists(sat_5_path)
-        assert not os.path.exists(sat_15_path)
+    # Assert that the file 'sat_5_path' exists
+    assert os.path.exists(sat_5_path)
+    assert not os.path.exists(sat_15_path)
 
-        # Check the satellite data is 5-minutely
-        check_timesteps(sat_5_path, expected_freq_mins=5)
+    # Check the satellite data is 5-minutely
+    check_timesteps(sat_5_path, expected_freq_mins=5)
 
 
+@pytest.mark.usefixtures("sat_tmpdir")
 def test_download_sat_15_data(sat_15_data):
     """Download only the 15 minute satellite data"""
 
-    # make temporary directory
-    with tempfile.TemporaryDirectory() as tmpdirname:
-
-        # Change to temporary working directory
-        os.chdir(tmpdirname)
-
-        # Make 15-minutely satellite data available
-        save_to_zarr_zip(sat_15_data, filename="latest_15.zarr.zip")
+    # Make 15-minutely satellite data available. Only the timestamps are checked
+    save_to_zarr_zip(sat_15_data, filename="latest_15.zarr.zip", with_data=False)
 
-        os.environ["SATELLITE_ZARR_PATH"] = "latest.zarr.zip"
+    download_all_sat_data()
 
-        download_all_sat_data()
+    # Assert that the file 'sat_15_path' exists
+    assert not os.path.exists(sat_5_path)
+    assert os.path.exists(sat_15_path)
 
-        # Assert that the file 'sat_15_path' exists
-        assert not os.path.exists(sat_5_path)
-        assert os.path.exists(sat_15_path)
-
-        # Check the satellite data is 15-minutely
-        check_timesteps(sat_15_path, expected_freq_mins=15)
+    # Check the satellite data is 15-minutely
+    check_timesteps(sat_15_path, expected_freq_mins=15)
 
 
+@pytest.mark.usefixtures("sat_tmpdir")
 def test_download_sat_both_data(sat_5_data, sat_15_data):
     """Download 5 minute sat and 15 minute satellite data"""
 
-    with tempfile.TemporaryDirectory() as tmpdirname:
-
-        # Change to temporary working directory
-        os.chdir(tmpdirname)
-
-        # Make 5- and 15-minutely satellite data available
-        save_to_zarr_zip(sat_5_data, filename="latest.zarr.zip")
-        save_to_zarr_zip(sat_15_data, filename="latest_15.zarr.zip")
-
-        os.environ["SATELLITE_ZARR_PATH"] = "latest.zarr.zip"
+    # Make 5- and 15-minutely satellite data available. Only the timestamps are checked
+    save_to_zarr_zip(sat_5_data, filename="latest.zarr.zip", with_data=False)
+    save_to_zarr_zip(sat_15_data, filename="latest_15.zarr.zip", with_data=False)
 
-        download_all_sat_data()
+    download_all_sat_data()
 
-        assert os.path.exists(sat_5_path)
-        assert os.path.exists(sat_15_path)
+    assert os.path.exists(sat_5_path)
+    assert os.path.exists(sat_15_path)
 
-        # Check this satellite data is 5-minutely
-        check_timesteps(sat_5_path, expected_freq_mins=5)
+    # Check this satellite data is 5-minutely
+    check_timesteps(sat_5_path, expected_freq_mins=5)
 
-        # Check this satellite data is 15-minutely
-        check_timesteps(sat_15_path, expected_freq_mins=15)
+    # Check this satellite data is 15-minutely
+    check_timesteps(sat_15_path, expected_freq_mins=15)
 
 
-def test_preprocess_sat_data(sat_5_data, test_t0):
-    """Download and process only the 5 minute satellite data"""
-
-    # make temporary directory
-    with tempfile.TemporaryDirectory() as tmpdirname:
-
-        # Change to temporary working directory
-        os.chdir(tmpdirname)
-
-        # Make 5-minutely satellite data available
-        save_to_zarr_zip(sat_5_data, filename="latest.zarr.zip")
-
-        os.environ["SATELLITE_ZARR_PATH"] = "latest.zarr.zip"
-        download_all_sat_data()
-
-        preprocess_sat_data(test_t0)
-
-        # Check the satellite data is 5-minutely
-        check_timesteps(sat_path, expected_freq_mins=5)
-
-
-def test_preprocess_sat_15_data(sat_15_data, test_t0):
-    """Download and process only the 15 minute satellite data"""
-
-    # make temporary directory
-    with tempfile.TemporaryDirectory() as tmpdirname:
-
-        # Change to temporary working directory
-        os.chdir(tmpdirname)
-
-        # Make 15-minutely satellite data available
-        save_to_zarr_zip(sat_15_data, filename="latest_15.zarr.zip")
-
-        os.environ["SATELLITE_ZARR_PATH"] = "latest.zarr.zip"
-        download_all_sat_data()
-
-        preprocess_sat_data(test_t0)
-
-        # We infill the satellite data to 5 minutes in the process step
-        check_timesteps(sat_path, expected_freq_mins=5)
-
-
-def test_preprocess_old_sat_5_data(sat_5_data_delayed, sat_15_data, test_t0):
-    """Download and process 5 and 15 minute satellite data. Use the 15 minute data since the
-    5 minute data is too delayed
-    """
-
-    # make temporary directory
-    with tempfile.TemporaryDirectory() as tmpdirname:
-
-        # Change to temporary working directory
-        os.chdir(tmpdirname)
+@pytest.mark.parametrize(
+    "zips",
+    [
+        # Only the 5 minute satellite data
+        {"latest.zarr.zip": "sat_5_zip"},
+        # Only the 15 minute satellite data
+        {"latest_15.zarr.zip": "sat_15_zip"},
+        # 5 and 15 minute data. The 15 minute data is used since the 5 minute data is too delayed
+        {"latest.zarr.zip": "sat_5_delayed_zip", "latest_15.zarr.zip": "sat_15_zip"},
+    ],
+    ids=["5_min", "15_min", "old_5_min"],
+)
+@pytest.mark.usefixtures("sat_tmpdir")
+def test_preprocess_sat_data(request, zips, test_t0):
+    """Download and process the available satellite data"""
 
-        save_to_zarr_zip(sat_5_data_delayed, filename="latest.zarr.zip")
-        save_to_zarr_zip(sat_15_data, filename="latest_15.zarr.zip")
+    for filename, zip_fixture in zips.items():
+        shutil.copy(request.getfixturevalue(zip_fixture), filename)
 
-        os.environ["SATELLITE_ZARR_PATH"] = "latest.zarr.zip"
-        download_all_sat_data()
+    download_all_sat_data()
 
-        preprocess_sat_data(test_t0)
+    preprocess_sat_data(test_t0)
 
-        # We infill the satellite data to 5 minutes in the process step
-        check_timesteps(sat_path, expected_freq_mins=5)
+    # We infill the satellite data to 5 minutes in the process step
+    check_timesteps(sat_path, expected_freq_mins=5)
 
 
 def test_check_model_satellite_inputs_available(config_filename):
 
-    t0 = datetime(2023,1,1)
-    sat_datetime_1 = pd.date_range(t0 - timedelta(minutes=120), t0 - timedelta(minutes=5), freq="5min")
-    sat_datetime_2 = pd.date_range(t0 - timedelta(minutes=120), t0 - timedelta(minutes=15), freq="5min")
-    sat_datetime_3 = pd.date_range(t0 - timedelta(minutes=120), t0 - timedelta(minutes=35), freq="5min")
-    sat_datetime_4 = pd.to_datetime([t for t in sat_datetime_1 if t!=t0-timedelta(minutes=30)])
-    sat_datetime_5 = pd.to_datetime([t for t in sat_datetime_1 if t!=t0-timedelta(minutes=60)])
-
-    assert check_model_satellite_inputs_available(config_filename, t0, sat_datetime_1)
-    assert check_model_satellite_inputs_available(config_filename, t0, sat_datetime_2)
-    assert not check_model_satellite_inputs_available(config_filename, t0, sat_datetime_3)
-    assert not check_model_satellite_inputs_available(config_filename, t0, sat_datetime_4)
-    assert not check_model_satellite_inputs_available(config_filename, t0, sat_datetime_5)
+    t0 = _SAT_T0
+    assert check_model_satellite_inputs_available(config_filename, t0, _SAT_DATETIMES_1)
+    assert check_model_satellite_inputs_available(config_filename, t0, _SAT_DATETIMES_2)
+    assert not check_model_satellite_inputs_available(config_filename, t0, _SAT_DATETIMES_3)
+    assert not check_model_satellite_inputs_available(config_filename, t0, _SAT_DATETIMES_4)
+    assert not check_model_satellite_inputs_available(config_filename, t0, _SAT_DATETIMES_5)
 
 
 def test_extend_satellite_data_with_nans(sat_5_data):
 
-    # make temporary directory
-    with tempfile.TemporaryDirectory() as tmpdirname:
+    # save sat to an in-memory zarr
+    store = zarr.MemoryStore()
+    sat_5_data.to_zarr(store, mode="w", consolidated=True, compute=True)
 
-        # Change to temporary working directory
-        os.chdir(tmpdirname)
+    time = sat_5_data.time.values
+    t0 = sat_5_data.time.values.max()
+    extend_satellite_data_with_nans(t0=t0, satellite_data_path=store)
 
-        # save sat to zarr
-        filename = "sat_5_data.zarr"
-        sat_5_data.to_zarr(filename)
-
-        time = sat_5_data.time.values
-        t0 = pd.to_datetime(sat_5_data.time).max()
-        extend_satellite_data_with_nans(t0=t0, satellite_data_path=filename)
-
-        # load new file
-        ds = xr.open_zarr(filename)
-        assert (ds.time.values == time).all()
+    # load new file
+    ds = xr.open_zarr(store, consolidated=True)
+    assert (ds.time.values == time).all()
 
 
 def test_extend_satellite_data_with_nans_over_3_hours(sat_5_data):
 
-    # make temporary directory
-    with tempfile.TemporaryDirectory() as tmpdirname:
-
-        # Change to temporary working directory
-        os.chdir(tmpdirname)
-
-        # save sat to zarr
-        filename = "sat_5_data.zarr"
-        sat_5_data.to_zarr(filename)
+    # save sat to an in-memory zarr
+    store = zarr.MemoryStore()
+    sat_5_data.to_zarr(store, mode="w", consolidated=True, compute=True)
 
-        time = sat_5_data.time.values
-        t0 = pd.to_datetime(sat_5_data.time).max() + pd.Timedelta(hours=4)
-        extend_satellite_data_with_nans(t0=t0, satellite_data_path=filename)
+    time = sat_5_data.time.values
+    t0 = sat_5_data.time.values.max() + np.timedelta64(4, "h")
+    extend_satellite_data_with_nans(t0=t0, satellite_data_path=store)
 
-        # load new file
-        ds = xr.open_zarr(filename)
-        assert len(time) + 3*12 == len(ds.time)
-        assert ds.time.values[-1] == t0
+    # load new file
+    ds = xr.open_zarr(store, consolidated=True)
+    assert len(time) + 3*12 == len(ds.time)
+    assert ds.time.values[-1] == t0
 
 
+@pytest.mark.usefixtures("sat_tmpdir")
 def test_zeros_in_sat_data(sat_15_data_small, test_t0):
     """Check error is made if data has zeros"""
 
-    # make temporary directory
-    with tempfile.TemporaryDirectory() as tmpdirname:
+    # make half the values zeros. The data is chunked so that this exercises the dask-backed path
+    # of save_to_zarr_zip
+    sat_15_data_small = sat_15_data_small.chunk({"time": 6})
+    mask = xr.DataArray(np.arange(sat_15_data_small.sizes["time"]) % 2 == 0, dims="time")
+    sat_15_data_small = sat_15_data_small.assign(data=sat_15_data_small["data"].where(~mask, 0))
 
-        # Change to temporary working directory
-        os.chdir(tmpdirname)
+    # Make 15-minutely satellite data available
+    save_to_zarr_zip(sat_15_data_small, filename="latest.zarr.zip")
 
-        # make half the values zeros
-        sat_15_data_small.data[::2] = 0
+    download_all_sat_data()
 
-        # Make 15-minutely satellite data available
-        save_to_zarr_zip(sat_15_data_small, filename="latest.zarr.zip")
-
-        os.environ["SATELLITE_ZARR_PATH"] = "latest.zarr.zip"
-        download_all_sat_data()
-
-        # check an error is made
-        with pytest.raises(Exception):
-            preprocess_sat_data(test_t0)
+    # check an error is made
+    with pytest.raises(Exception):
+        preprocess_sat_data(test_t0)
 
 
+@pytest.mark.usefixtures("sat_tmpdir")
 def test_remove_satellite_data(sat_15_data_small, test_t0):
     """Check error is made if data has nans"""
-    # make temporary directory
-    with tempfile.TemporaryDirectory() as tmpdirname:
-        # Change to temporary working directory
-        os.chdir(tmpdirname)
 
-        # make half the values zeros
-        sat_15_data_small = sat_15_data_small.copy(deep=True)
-        sat_15_data_small.data[::2] = np.nan
+    # make half the values nans. The data is chunked so that this exercises the dask-backed path
+    # of save_to_zarr_zip
+    sat_15_data_small = sat_15_data_small.chunk({"time": 6})
+    mask = xr.DataArray(np.arange(sat_15_data_small.sizes["time"]) % 2 == 0, dims="time")
+    sat_15_data_small = sat_15_data_small.assign(data=sat_15_data_small["data"].where(~mask))
 
-        # Make 15-minutely satellite data available
-        save_to_zarr_zip(sat_15_data_small, filename="latest.zarr.zip")
+    # Make 15-minutely satellite data available
+    save_to_zarr_zip(sat_15_data_small, filename="latest.zarr.zip")
 
-        os.environ["SATELLITE_ZARR_PATH"] = "latest.zarr.zip"
-        download_all_sat_data()
+    download_all_sat_data()
 
-        # check an error is made
-        with pytest.raises(Exception):
-            preprocess_sat_data(test_t0)
+    # check an error is made
+    with pytest.raises(Exception):
+        preprocess_sat_data(test_t0)
 
 
-def test_interpolate_missing_satellite_timestamps(tmp_path):
+def test_interpolate_missing_satellite_timestamps():
     """Test that missing timestamps are interpolated"""
 
     # Create a 15 minutely dataset with missing timestamp
@@ -304,73 +307,47 @@ def test_interpolate_missing_satellite_timestamps(tmp_path):
         dims=["time"],
         coords=dict(time=times),
     ).to_dataset(name="data")
-    ds.to_zarr(tmp_path)
-    
+    store = zarr.MemoryStore()
+    ds.to_zarr(store, consolidated=True)
+
     # This function loads data from sat_path, interpolates it adn saves it back to sat_path
-    interpolate_missing_satellite_timestamps(max_gap=pd.Timedelta("15min"), zarr_path=tmp_path)
+    interpolate_missing_satellite_timestamps(max_gap=pd.Timedelta("15min"), zarr_path=store)
 
     # Reload the interpolated dataset
-    ds_interp = xr.open_zarr(tmp_path)
+    ds_interp = xr.open_zarr(store, consolidated=True)
 
     # The function interpolates to 5 minute intervals but will only interpolate between 
     # timestamps if there is less than 15 minutes between them. In this case, the 5 minute
     # intervals between the first two timestamps should not have been interpolated because
     # there is a 30 minute gap
-    expected_times = pd.date_range(start=t_start, end=t_end, freq="5min")
-    expected_times = [t for t in expected_times if not (times[0] < t < times[1])]
+    expected_times = pd.date_range(start=t_start, end=t_end, freq="5min").values
+    expected_times = expected_times[~((expected_times > times[0]) & (expected_times < times[1]))]
 
-    assert (pd.to_datetime(ds_interp.time)==pd.to_datetime(expected_times)).all().item()
+    assert np.array_equal(
+        ds_interp.time.values.astype("datetime64[ns]"),
+        expected_times.astype("datetime64[ns]"),
+    )
 
     assert (ds_interp.data.values==1).all().item()
 
 
-def test_check_for_constant_values(sat_5_data):
-    """Test check_for_constant_values"""
-
-    # make temporary directory
-    with tempfile.TemporaryDirectory() as tmpdirname:
-
-        # Change to temporary working directory
-        os.chdir(tmpdirname)
-
-        # Make 5-minutely satellite data available
-        sat_5_data.to_zarr("sat.zarr")
-
-        check_for_constant_values()
-
-
-def test_check_for_constant_values_zeros(sat_5_data):
-    """Test check_for_constant_values error with lots of zeros"""
-
-    sat_5_data = sat_5_data.copy(deep=True)
-
-    sat_5_data['data'].values[:] = 0
-
-    # make temporary directory
-    with tempfile.TemporaryDirectory() as tmpdirname:
-        # Change to temporary working directory
-        os.chdir(tmpdirname)
-
-        # Make 5-minutely satellite data available
-        sat_5_data.to_zarr("sat.zarr")
-
-        with pytest.raises(Exception):
-            check_for_constant_values()
-
-
-def test_check_for_constant_values_nans(sat_5_data):
-    """Test check_for_constant_values, error with nans"""
-
-    sat_5_data = sat_5_data.copy(deep=True)
-    sat_5_data['data'].values[:] = np.nan
+@pytest.mark.parametrize(
+    "fill_value,check_value,raises",
+    [
+        (None, 0, False),
+        (0, 0, True),
+        (np.nan, np.nan, True),
+    ],
+)
+def test_check_for_constant_values(sat_5_data, fill_value, check_value, raises):
+    """Test check_for_constant_values, and that it raises an error with lots of zeros or nans"""
 
-    # make temporary directory
-    with tempfile.TemporaryDirectory() as tmpdirname:
-        # Change to temporary working directory
-        os.chdir(tmpdirname)
+    if fill_value is not None:
+        sat_5_data = sat_5_data.assign(data=xr.full_like(sat_5_data["data"], fill_value))
 
-        # Make 5-minutely satellite data available
-        sat_5_data.to_zarr("sat.zarr")
+    # Make 5-minutely satellite data available
+    store = zarr.MemoryStore()
+    sat_5_data.to_zarr(store, consolidated=True)
 
-        with pytest.raises(Exception):
-            check_for_constant_values(value=np.nan)
+    with pytest.raises(Exception) if raises else nullcontext():
+        check_for_constant_values(value=check_value, zarr_path=store)
@@ -1,6 +1,3 @@
-import os
-import tempfile
-
 import zarr
 from nowcasting_datamodel.models.forecast import (
     ForecastSQL,
@@ -13,42 +10,49 @@ from pvnet_app.model_configs.pydantic_models import get_all_models
 
 
 
-def test_app(test_t0, db_session, nwp_ukv_data, nwp_ecmwf_data, sat_5_data_zero_delay, db_url):
+def test_app(
+    test_t0,
+    db_session,
+    nwp_ukv_data,
+    nwp_ecmwf_data,
+    sat_5_data_zero_delay,
+    db_url,
+    tmp_path,
+    monkeypatch,
+):
     """Test the app running the intraday models"""
 
-    with tempfile.TemporaryDirectory() as tmpdirname:
-
-        os.chdir(tmpdirname)
+    monkeypatch.chdir(tmp_path)
 
-        os.environ["DB_URL"] = db_url
+    monkeypatch.setenv("DB_URL", db_url)
 
-        # The app loads sat and NWP data from environment variable
-        # Save out data, and set paths as environmental variables
-        temp_nwp_path = "temp_nwp_ukv.zarr"
-        os.environ["NWP_UKV_ZARR_PATH"] = temp_nwp_path
-        nwp_ukv_data.to_zarr(temp_nwp_path)
+    # The app loads sat and NWP data from environment variable
+    # Save out data, and set paths as environmental variables
+    temp_nwp_path = "temp_nwp_ukv.zarr"
+    monkeypatch.setenv("NWP_UKV_ZARR_PATH", temp_nwp_path)
+    nwp_ukv_data.to_zarr(temp_nwp_path)
 
-        temp_nwp_path = "temp_nwp_ecmwf.zarr"
-        os.environ["NWP_ECMWF_ZARR_PATH"] = temp_nwp_path
-        nwp_ecmwf_data.to_zarr(temp_nwp_path)
+    temp_nwp_path = "temp_nwp_ecmwf.zarr"
+    monkeypatch.setenv("NWP_ECMWF_ZARR_PATH", temp_nwp_path)
+    nwp_ecmwf_data.to_zarr(temp_nwp_path)
 
-        # In production sat zarr is zipped
-        temp_sat_path = "temp_sat.zarr.zip"
-        os.environ["SATELLITE_ZARR_PATH"] = temp_sat_path
-        with zarr.storage.ZipStore(temp_sat_path, mode="x") as store:
-            sat_5_data_zero_delay.to_zarr(store)
+    # In production sat zarr is zipped
+    temp_sat_path = "temp_sat.zarr.zip"
+    monkeypatch.setenv("SATELLITE_ZARR_PATH", temp_sat_path)
+    with zarr.storage.ZipStore(temp_sat_path, mode="x") as store:
+        sat_5_data_zero_delay.to_zarr(store)
 
-        # Set environmental variables
-        os.environ["RUN_EXTRA_MODELS"] = "True"
-        os.environ["SAVE_GSP_SUM"] = "True"
-        os.environ["DAY_AHEAD_MODEL"] = "False"
-        os.environ["FORECAST_VALIDATE_ZIG_ZAG_ERROR"] = "100000"
+    # Set environmental variables
+    monkeypatch.setenv("RUN_EXTRA_MODELS", "True")
+    monkeypatch.setenv("SAVE_GSP_SUM", "True")
+    monkeypatch.setenv("DAY_AHEAD_MODEL", "False")
+    monkeypatch.setenv("FORECAST_VALIDATE_ZIG_ZAG_ERROR", "100000")
 
-        # Run prediction
-        # These imports need to come after the environ vars have been set
-        from pvnet_app.app import app
+    # Run prediction
+    # These imports need to come after the environ vars have been set
+    from pvnet_app.app import app
 
-        app(t0=test_t0, gsp_ids=list(range(1, 318)), num_workers=2)
+    app(t0=test_t0, gsp_ids=list(range(1, 318)), num_workers=2)
 
     all_models = get_all_models(run_extra_models=True)
 
@@ -82,37 +86,37 @@ def test_app(test_t0, db_session, nwp_ukv_data, nwp_ecmwf_data, sat_5_data_zero_
     assert len(db_session.query(ForecastValueSevenDaysSQL).all()) == expected_forecast_results * 16
 
 
-def test_app_no_sat(test_t0, db_session, nwp_ukv_data, nwp_ecmwf_data, db_url):
+def test_app_no_sat(
+    test_t0, db_session, nwp_ukv_data, nwp_ecmwf_data, db_url, tmp_path, monkeypatch,
+):
     """Test the app for the case when no satellite data is available"""
 
-    with tempfile.TemporaryDirectory() as tmpdirname:
+    monkeypatch.chdir(tmp_path)
 
-        os.chdir(tmpdirname)
+    monkeypatch.setenv("DB_URL", db_url)
 
-        os.environ["DB_URL"] = db_url
+    temp_nwp_path = "temp_nwp_ukv.zarr"
+    monkeypatch.setenv("NWP_UKV_ZARR_PATH", temp_nwp_path)
+    nwp_ukv_data.to_zarr(temp_nwp_path)
 
-        temp_nwp_path = "temp_nwp_ukv.zarr"
-        os.environ["NWP_UKV_ZARR_PATH"] = temp_nwp_path
-        nwp_ukv_data.to_zarr(temp_nwp_path)
+    temp_nwp_path = "temp_nwp_ecmwf.zarr"
+    monkeypatch.setenv("NWP_ECMWF_ZARR_PATH", temp_nwp_path)
+    nwp_ecmwf_data.to_zarr(temp_nwp_path)
 
-        temp_nwp_path = "temp_nwp_ecmwf.zarr"
-        os.environ["NWP_ECMWF_ZARR_PATH"] = temp_nwp_path
-        nwp_ecmwf_data.to_zarr(temp_nwp_path)
+    # There is no satellite data available at the environ path
+    monkeypatch.setenv("SATELLITE_ZARR_PATH", "nonexistent_sat.zarr.zip")
 
-        # There is no satellite data available at the environ path
-        os.environ["SATELLITE_ZARR_PATH"] = "nonexistent_sat.zarr.zip"
+    monkeypatch.setenv("RUN_EXTRA_MODELS", "True")
+    monkeypatch.setenv("SAVE_GSP_SUM", "True")
+    monkeypatch.setenv("DAY_AHEAD_MODEL", "False")
+    monkeypatch.setenv("USE_OCF_DATA_SAMPLER", "True")
+    monkeypatch.setenv("FORECAST_VALIDATE_ZIG_ZAG_ERROR", "100000")
 
-        os.environ["RUN_EXTRA_MODELS"] = "True"
-        os.environ["SAVE_GSP_SUM"] = "True"
-        os.environ["DAY_AHEAD_MODEL"] = "False"
-        os.environ["USE_OCF_DATA_SAMPLER"] = "True"
-        os.environ["FORECAST_VALIDATE_ZIG_ZAG_ERROR"] = "100000"
+    # Run prediction
+    # Thes import needs to come after the environ vars have been set
+    from pvnet_app.app import app
 
-        # Run prediction
-        # Thes import needs to come after the environ vars have been set
-        from pvnet_app.app import app
-
-        app(t0=test_t0, gsp_ids=list(range(1, 318)), num_workers=2)
+    app(t0=test_t0, gsp_ids=list(range(1, 318)), num_workers=2)
 
     # Only the models which don't use satellite will be run in this case
     # The models below are the only ones which should have been run
@@ -151,32 +155,32 @@ def test_app_no_sat(test_t0, db_session, nwp_ukv_data, nwp_ecmwf_data, db_url):
 
 # Test for new DA model with data sampler utilisation
 # To note - Satellite omitted
-def test_app_day_ahead_data_sampler(test_t0, db_session, nwp_ukv_data, nwp_ecmwf_data, db_url):
+def test_app_day_ahead_data_sampler(
+    test_t0, db_session, nwp_ukv_data, nwp_ecmwf_data, db_url, tmp_path, monkeypatch,
+):
     """Test the app running the day ahead model"""
 
-    with tempfile.TemporaryDirectory() as tmpdirname:
-
-        os.chdir(tmpdirname)
+    monkeypatch.chdir(tmp_path)
 
-        os.environ["DB_URL"] = db_url
+    monkeypatch.setenv("DB_URL", db_url)
 
-        temp_nwp_path = "temp_nwp_ukv.zarr"
-        os.environ["NWP_UKV_ZARR_PATH"] = temp_nwp_path
-        nwp_ukv_data.to_zarr(temp_nwp_path)
+    temp_nwp_path = "temp_nwp_ukv.zarr"
+    monkeypatch.setenv("NWP_UKV_ZARR_PATH", temp_nwp_path)
+    nwp_ukv_data.to_zarr(temp_nwp_path)
 
-        temp_nwp_path = "temp_nwp_ecmwf.zarr"
-        os.environ["NWP_ECMWF_ZARR_PATH"] = temp_nwp_path
-        nwp_ecmwf_data.to_zarr(temp_nwp_path)
+    temp_nwp_path = "temp_nwp_ecmwf.zarr"
+    monkeypatch.setenv("NWP_ECMWF_ZARR_PATH", temp_nwp_path)
+    nwp_ecmwf_data.to_zarr(temp_nwp_path)
 
-        os.environ["SATELLITE_ZARR_PATH"] = "nonexistent_sat.zarr.zip"
-        os.environ["DAY_AHEAD_MODEL"] = "True"
-        os.environ["RUN_EXTRA_MODELS"] = "False"
-        os.environ["USE_OCF_DATA_SAMPLER"] = "True"
-        os.environ["FORECAST_VALIDATE_ZIG_ZAG_ERROR"] = "100000"
+    monkeypatch.setenv("SATELLITE_ZARR_PATH", "nonexistent_sat.zarr.zip")
+    monkeypatch.setenv("DAY_AHEAD_MODEL", "True")
+    monkeypatch.setenv("RUN_EXTRA_MODELS", "False")
+    monkeypatch.setenv("USE_OCF_DATA_SAMPLER", "True")
+    monkeypatch.setenv("FORECAST_VALIDATE_ZIG_ZAG_ERROR", "100000")
 
-        # Import at runtime to ensure environment variables are set
-        from pvnet_app.app import app
-        app(t0=test_t0, gsp_ids=list(range(1, 318)), num_workers=2)
+    # Import at runtime to ensure environment variables are set
+    from pvnet_app.app import app
+    app(t0=test_t0, gsp_ids=list(range(1, 318)), num_workers=2)
 
     all_models = get_all_models(get_day_ahead_only=True, use_ocf_data_sampler=True)
 
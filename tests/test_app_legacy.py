@@ -1,6 +1,3 @@
-import os
-import tempfile
-
 import zarr
 from nowcasting_datamodel.models.forecast import (
     ForecastSQL,
@@ -14,35 +11,33 @@ from pvnet_app.model_configs.pydantic_models import get_all_models
 
 # Its nice to have this here, so we can run the latest version in production, but still use the old models
 # Once we have re trained PVnet summation models we can remove this
-def test_app_ecwmf_only(test_t0, db_session, nwp_ecmwf_data, db_url):
+def test_app_ecwmf_only(test_t0, db_session, nwp_ecmwf_data, db_url, tmp_path, monkeypatch):
     """Test the app for the case running model just on ecmwf"""
 
-    with tempfile.TemporaryDirectory() as tmpdirname:
-
-        os.chdir(tmpdirname)
+    monkeypatch.chdir(tmp_path)
 
-        os.environ["DB_URL"] = db_url
+    monkeypatch.setenv("DB_URL", db_url)
 
-        temp_nwp_path = "temp_nwp_ecmwf.zarr"
-        os.environ["NWP_ECMWF_ZARR_PATH"] = temp_nwp_path
-        nwp_ecmwf_data.to_zarr(temp_nwp_path)
+    temp_nwp_path = "temp_nwp_ecmwf.zarr"
+    monkeypatch.setenv("NWP_ECMWF_ZARR_PATH", temp_nwp_path)
+    nwp_ecmwf_data.to_zarr(temp_nwp_path)
 
-        # There is no satellite or ukv data available at the environ path
-        os.environ["SATELLITE_ZARR_PATH"] = "nonexistent_sat.zarr.zip"
-        os.environ["NWP_UKV_ZARR_PATH"] = "nonexistent_nwp.zarr.zip"
+    # There is no satellite or ukv data available at the environ path
+    monkeypatch.setenv("SATELLITE_ZARR_PATH", "nonexistent_sat.zarr.zip")
+    monkeypatch.setenv("NWP_UKV_ZARR_PATH", "nonexistent_nwp.zarr.zip")
 
-        os.environ["RUN_EXTRA_MODELS"] = "False"
-        os.environ["SAVE_GSP_SUM"] = "True"
-        os.environ["DAY_AHEAD_MODEL"] = "False"
-        os.environ["USE_OCF_DATA_SAMPLER"] = "False"
-        os.environ["USE_ECMWF_ONLY"] = "True"
-        os.environ["FORECAST_VALIDATE_ZIG_ZAG_ERROR"] = "100000"
+    monkeypatch.setenv("RUN_EXTRA_MODELS", "False")
+    monkeypatch.setenv("SAVE_GSP_SUM", "True")
+    monkeypatch.setenv("DAY_AHEAD_MODEL", "False")
+    monkeypatch.setenv("USE_OCF_DATA_SAMPLER", "False")
+    monkeypatch.setenv("USE_ECMWF_ONLY", "True")
+    monkeypatch.setenv("FORECAST_VALIDATE_ZIG_ZAG_ERROR", "100000")
 
-        # Run prediction
-        # Thes import needs to come after the environ vars have been set
-        from pvnet_app.app import app
+    # Run prediction
+    # Thes import needs to come after the environ vars have been set
+    from pvnet_app.app import app
 
-        app(t0=test_t0, gsp_ids=list(range(1, 318)), num_workers=2)
+    app(t0=test_t0, gsp_ids=list(range(1, 318)), num_workers=2)
 
     # Only the models which don't use satellite will be run in this case
     # The models below are the only ones which should have been run
@@ -81,38 +76,39 @@ def test_app_ecwmf_only(test_t0, db_session, nwp_ecmwf_data, db_url):
 # test legacy models
 # Its nice to have this here, so we can run the latest version in production, but still use the old models
 # Once we have re trained PVnet summation models we can remove this
-def test_app_ocf_datapipes(test_t0, db_session, nwp_ukv_data, nwp_ecmwf_data, sat_5_data, db_url):
+def test_app_ocf_datapipes(
+    test_t0, db_session, nwp_ukv_data, nwp_ecmwf_data, sat_5_data, db_url, tmp_path, monkeypatch,
+):
     """Test the app running the day ahead model"""
 
-    with tempfile.TemporaryDirectory() as tmpdirname:
-        os.chdir(tmpdirname)
+    monkeypatch.chdir(tmp_path)
 
-        os.environ["DB_URL"] = db_url
+    monkeypatch.setenv("DB_URL", db_url)
 
-        temp_nwp_path = "temp_nwp_ukv.zarr"
-        os.environ["NWP_UKV_ZARR_PATH"] = temp_nwp_path
-        nwp_ukv_data.to_zarr(temp_nwp_path)
+    temp_nwp_path = "temp_nwp_ukv.zarr"
+    monkeypatch.setenv("NWP_UKV_ZARR_PATH", temp_nwp_path)
+    nwp_ukv_data.to_zarr(temp_nwp_path)
 
-        temp_nwp_path = "temp_nwp_ecmwf.zarr"
-        os.environ["NWP_ECMWF_ZARR_PATH"] = temp_nwp_path
-        nwp_ecmwf_data.to_zarr(temp_nwp_path)
+    temp_nwp_path = "temp_nwp_ecmwf.zarr"
+    monkeypatch.setenv("NWP_ECMWF_ZARR_PATH", temp_nwp_path)
+    nwp_ecmwf_data.to_zarr(temp_nwp_path)
 
-        temp_sat_path = "temp_sat.zarr.zip"
-        os.environ["SATELLITE_ZARR_PATH"] = temp_sat_path
-        with zarr.storage.ZipStore(temp_sat_path, mode="x") as store:
-            sat_5_data.to_zarr(store)
+    temp_sat_path = "temp_sat.zarr.zip"
+    monkeypatch.setenv("SATELLITE_ZARR_PATH", temp_sat_path)
+    with zarr.storage.ZipStore(temp_sat_path, mode="x") as store:
+        sat_5_data.to_zarr(store)
 
-        os.environ["DAY_AHEAD_MODEL"] = "False"
-        os.environ["RUN_EXTRA_MODELS"] = "False"
-        os.environ["USE_OCF_DATA_SAMPLER"] = "False"
-        os.environ["USE_ECMWF_ONLY"] = "False"
-        os.environ["FORECAST_VALIDATE_ZIG_ZAG_ERROR"] = "100000"
+    monkeypatch.setenv("DAY_AHEAD_MODEL", "False")
+    monkeypatch.setenv("RUN_EXTRA_MODELS", "False")
+    monkeypatch.setenv("USE_OCF_DATA_SAMPLER", "False")
+    monkeypatch.setenv("USE_ECMWF_ONLY", "False")
+    monkeypatch.setenv("FORECAST_VALIDATE_ZIG_ZAG_ERROR", "100000")
 
-        # Run prediction
-        # Thes import needs to come after the environ vars have been set
-        from pvnet_app.app import app
+    # Run prediction
+    # Thes import needs to come after the environ vars have been set
+    from pvnet_app.app import app
 
-        app(t0=test_t0, gsp_ids=list(range(1, 318)), num_workers=2)
+    app(t0=test_t0, gsp_ids=list(range(1, 318)), num_workers=2)
 
     all_models = get_all_models(use_ocf_data_sampler=False)
 
@@ -148,38 +144,38 @@ def test_app_ocf_datapipes(test_t0, db_session, nwp_ukv_data, nwp_ecmwf_data, sa
     )
 
 
-def test_app_day_ahead_model(test_t0, db_session, nwp_ukv_data, nwp_ecmwf_data, sat_5_data, db_url):
+def test_app_day_ahead_model(
+    test_t0, db_session, nwp_ukv_data, nwp_ecmwf_data, sat_5_data, db_url, tmp_path, monkeypatch,
+):
     """Test the app running the day ahead model"""
 
-    with tempfile.TemporaryDirectory() as tmpdirname:
-
-        os.chdir(tmpdirname)
+    monkeypatch.chdir(tmp_path)
 
-        os.environ["DB_URL"] = db_url
+    monkeypatch.setenv("DB_URL", db_url)
 
-        temp_nwp_path = "temp_nwp_ukv.zarr"
-        os.environ["NWP_UKV_ZARR_PATH"] = temp_nwp_path
-        nwp_ukv_data.to_zarr(temp_nwp_path)
+    temp_nwp_path = "temp_nwp_ukv.zarr"
+    monkeypatch.setenv("NWP_UKV_ZARR_PATH", temp_nwp_path)
+    nwp_ukv_data.to_zarr(temp_nwp_path)
 
-        temp_nwp_path = "temp_nwp_ecmwf.zarr"
-        os.environ["NWP_ECMWF_ZARR_PATH"] = temp_nwp_path
-        nwp_ecmwf_data.to_zarr(temp_nwp_path)
+    temp_nwp_path = "temp_nwp_ecmwf.zarr"
+    monkeypatch.setenv("NWP_ECMWF_ZARR_PATH", temp_nwp_path)
+    nwp_ecmwf_data.to_zarr(temp_nwp_path)
 
-        temp_sat_path = "temp_sat.zarr.zip"
-        os.environ["SATELLITE_ZARR_PATH"] = temp_sat_path
-        with zarr.storage.ZipStore(temp_sat_path, mode="x") as store:
-            sat_5_data.to_zarr(store)
+    temp_sat_path = "temp_sat.zarr.zip"
+    monkeypatch.setenv("SATELLITE_ZARR_PATH", temp_sat_path)
+    with zarr.storage.ZipStore(temp_sat_path, mode="x") as store:
+        sat_5_data.to_zarr(store)
 
-        os.environ["DAY_AHEAD_MODEL"] = "True"
-        os.environ["RUN_EXTRA_MODELS"] = "False"
-        os.environ["USE_OCF_DATA_SAMPLER"] = "False"
-        os.environ["FORECAST_VALIDATE_ZIG_ZAG_ERROR"] = "100000"
+    monkeypatch.setenv("DAY_AHEAD_MODEL", "True")
+    monkeypatch.setenv("RUN_EXTRA_MODELS", "False")
+    monkeypatch.setenv("USE_OCF_DATA_SAMPLER", "False")
+    monkeypatch.setenv("FORECAST_VALIDATE_ZIG_ZAG_ERROR", "100000")
 
-        # Run prediction
-        # Thes import needs to come after the environ vars have been set
-        from pvnet_app.app import app
+    # Run prediction
+    # Thes import needs to come after the environ vars have been set
+    from pvnet_app.app import app
 
-        app(t0=test_t0, gsp_ids=list(range(1, 318)), num_workers=2)
+    app(t0=test_t0, gsp_ids=list(range(1, 318)), num_workers=2)
 
     all_models = get_all_models(get_day_ahead_only=True, use_ocf_data_sampler=False)
 